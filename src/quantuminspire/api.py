@@ -31,8 +31,12 @@ from typing import Type, List, Dict, Union, Optional, Any, Tuple
 from collections import OrderedDict
 from urllib.parse import urljoin
 import coreapi
+import requests
 from coreapi.auth import TokenAuthentication
 from coreapi.exceptions import CoreAPIException, ErrorMessage
+from coreapi.transports import HTTPTransport
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from quantuminspire.credentials import load_account
 from quantuminspire.exceptions import ApiError, AuthenticationError
@@ -42,6 +46,24 @@ QI_URL = 'https://api.quantum-inspire.com'
 logger = logging.getLogger(__name__)
 
 
+def _create_session(pool_size: int = 16) -> requests.Session:
+    """ Create the HTTP session used by the coreapi client of a :class:`QuantumInspireAPI` instance.
+
+    Connections are kept alive in a pool that is large enough for concurrent requests, and idempotent requests
+    are retried with a short backoff when a connection fails.
+
+    :param pool_size: Maximum number of connections kept alive per host.
+
+    :return: The configured session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
 class QuantumInspireAPI:
 
     def __init__(self, base_uri: str = QI_URL, authentication: Optional[coreapi.auth.AuthBase] = None,
@@ -79,7 +101,8 @@ class QuantumInspireAPI:
                 When authentication is :obj:`None`, a token is read from the default location.
         :param project_name: The name of the project used for executing the jobs.
         :param coreapi_client_class: Coreapi client to interact with the API through a schema.
-                Default set to :class:`coreapi.Client`.
+                Default set to :class:`coreapi.Client`, which is given a keep-alive session with connection
+                pooling and retries. Other client classes are only given the authentication.
 
         :raises AuthenticationError: When no authentication is given
                 and the token could not be loaded from the default location.
@@ -98,7 +121,12 @@ class QuantumInspireAPI:
                 authentication = TokenAuthentication(token, scheme="token")
             else:
                 raise AuthenticationError('No credentials have been provided or found on disk')
-        self.__client = coreapi_client_class(auth=authentication)
+        if coreapi_client_class is coreapi.Client:
+            # coreapi.Client does not pass a session on to its transport, so the transport is created here
+            transport = HTTPTransport(auth=authentication, session=_create_session())
+            self.__client = coreapi_client_class(transports=[transport])
+        else:
+            self.__client = coreapi_client_class(auth=authentication)
         self.project_name = project_name
         self.base_uri = base_uri
         self.enable_fsp_warning = True
@@ -19,15 +19,14 @@
 # limitations under the License.
 
 import inspect
-import random
 import sys
-from collections import defaultdict
 from functools import reduce
-from typing import List, Dict, Iterator, Union, Optional, Tuple, Any
+from typing import List, Dict, Iterable, Iterator, NamedTuple, Union, Optional, Tuple, Any, Callable
 
+import numpy as np
 from projectq.cengines import BasicEngine
 from projectq.meta import LogicalQubitIDTag, get_control_count
-from projectq.ops import (NOT, Allocate, Barrier, Deallocate, FlushGate, H,
+from projectq.ops import (NOT, Allocate, AllocateQubitGate, Barrier, Deallocate, DeallocateQubitGate, FlushGate, H,
                           Measure, Ph, Rx, Ry, Rz, S, Sdag, Swap, T, Tdag, X,
                           Y, Z, Command, CZ, C, R, CNOT, Toffoli)
 from projectq.types import Qubit
@@ -37,12 +36,60 @@ from quantuminspire.exceptions import ProjectQBackendError
 # shortcut for Controlled Phase-shift gate (CR)
 CR = C(R)
 
+# gates that carry an angle are looked up in the gate handlers by their type instead of by the gate itself
+_PARAMETERIZED_GATE_TYPES = (Rx, Ry, Rz, R)
+
+# cQASM names of the single qubit gates and rotations, by gate type
+_GATE_NAMES: Dict[type, str] = {type(gate): str(gate).lower() for gate in (X, Y, Z, H, S, T)}
+_GATE_NAMES.update({Rx: 'rx', Ry: 'ry', Rz: 'rz'})
+
+# maps (gate or parameterized gate type, number of control qubits) to the QIBackend method translating the command
+_GATE_HANDLERS: Dict[Tuple[Any, int], Callable[['QIBackend', Command], None]] = {}
+
+
+def _gate_handler(*keys: Tuple[Any, int]) -> Callable[[Callable[['QIBackend', Command], None]],
+                                                      Callable[['QIBackend', Command], None]]:
+    """ Register the decorated QIBackend method as translation of the commands with the given keys.
+
+    :param keys: One or more tuples (gate, control count). Parameterized gates are given by their type.
+
+    :return:
+        Decorator that registers the method in :data:`_GATE_HANDLERS` and returns it unchanged.
+    """
+    def decorator(method: Callable[['QIBackend', Command], None]) -> Callable[['QIBackend', Command], None]:
+        for key in keys:
+            _GATE_HANDLERS[key] = method
+        return method
+    return decorator
+
+
+# histograms with fewer states than this are filtered with a dict loop, the NumPy setup cost dominates below it
+_VECTORIZED_HISTOGRAM_SIZE = 1024
+
+
+# cQASM headers by (backend class, number of qubits), see _cqasm_header
+_CQASM_HEADERS: Dict[Tuple[type, int], str] = {}
+
+
+def _cqasm_header(backend_class: type, number_of_qubits: int) -> str:
+    """ Return the version, comment and qubits lines that start the cQASM generated by a backend class. """
+    header = _CQASM_HEADERS.get((backend_class, number_of_qubits))
+    if header is None:
+        header = f'version 1.0\n# cQASM generated by Quantum Inspire {backend_class} class\nqubits {number_of_qubits}\n'
+        _CQASM_HEADERS[(backend_class, number_of_qubits)] = header
+    return header
+
+
+class _MeasuredQubit(NamedTuple):
+    """ Reference to a logical qubit, used to register its measurement result with the main engine. """
+    id: int
+
 
 class QIBackend(BasicEngine):  # type: ignore
     """ Backend for Quantum Inspire """
 
     def __init__(self, num_runs: int = 1024, verbose: int = 0, quantum_inspire_api: Optional[QuantumInspireAPI] = None,
-                 backend_type: Optional[Union[int, str]] = None) -> None:
+                 backend_type: Optional[Union[int, str]] = None, seed: Optional[int] = None) -> None:
         """
         Initialize the Backend object.
 
@@ -51,6 +98,8 @@ class QIBackend(BasicEngine):  # type: ignore
         :param quantum_inspire_api: Connection to QI platform, optional parameter.
         :param backend_type: Backend to use for execution.
             When no backend_type is provided, the default backend will be used.
+        :param seed: Seed for drawing the measurement outcome that is registered with ProjectQ from the result.
+            When no seed is provided, the outcome is drawn from fresh, unpredictable entropy.
 
         :raises AuthenticationError: When an authentication error occurs.
         """
@@ -59,15 +108,17 @@ class QIBackend(BasicEngine):  # type: ignore
         """ Because engines are meant to be 'single use' by the way ProjectQ is designed,
         any additional gates received after a FlushGate triggers an exception. """
         self._clear: bool = True
-        self._qasm: str = ""
+        self._qasm_parts: List[str] = []
         self._reset()
         self._verbose: int = verbose
         self._cqasm: str = str()
         self._measured_states: Dict[int, float] = {}
         self._measured_ids: List[int] = []
         self._allocation_map: List[Tuple[int, int]] = []
+        self._simulated_positions: Dict[int, int] = {}
         self._max_qubit_id: int = -1
         self._quantum_inspire_result: Dict[str, Any] = {}
+        self._rng: np.random.Generator = np.random.default_rng(seed)
         if quantum_inspire_api is None:
             try:
                 quantum_inspire_api = QuantumInspireAPI()
@@ -83,6 +134,8 @@ class QIBackend(BasicEngine):  # type: ignore
         self._is_simulation_backend = not self._backend_type["is_hardware_backend"]
         self._max_number_of_qubits: int = self._backend_type["number_of_qubits"]
         self._one_qubit_gates: Tuple[Any, ...] = self._get_one_qubit_gates()
+        self._one_qubit_gate_types: Tuple[type, ...] = tuple(gate for gate in self._one_qubit_gates
+                                                             if inspect.isclass(gate))
         self._two_qubit_gates: Tuple[Any, ...] = self._get_two_qubit_gates()
         self._three_qubit_gates: Tuple[Any, ...] = self._get_three_qubit_gates()
 
@@ -149,7 +202,7 @@ class QIBackend(BasicEngine):  # type: ignore
     @property
     def qasm(self) -> str:
         """ Return qasm code at any moment in the process. """
-        return self._qasm
+        return '\n' + '\n'.join(self._qasm_parts) if self._qasm_parts else ''
 
     def is_available(self, cmd: Command) -> bool:
         """
@@ -180,11 +233,7 @@ class QIBackend(BasicEngine):  # type: ignore
         if g in (T, Tdag, S, Sdag, H, X, Y, Z):
             return g in self.one_qubit_gates
         if isinstance(g, (Rx, Ry, Rz)):
-            one_qubit_types = []
-            for gate in self.one_qubit_gates:
-                if inspect.isclass(gate):
-                    one_qubit_types.append(gate)
-            return isinstance(g, tuple(one_qubit_types))
+            return isinstance(g, self._one_qubit_gate_types)
         if isinstance(g, Ph):
             return False
 
@@ -193,10 +242,10 @@ class QIBackend(BasicEngine):  # type: ignore
     def _reset(self) -> None:
         """ Reset qasm string.
 
-        Reset temporary variable :attr:`qasm` to an initial value and set a flag
+        Reset the buffer of qasm lines behind :attr:`qasm` to an initial value and set a flag
         to clear variables when :meth:`~._store` is called. """
         self._clear = True
-        self._qasm = ""
+        self._qasm_parts = []
 
     def _allocate_qubit(self, index_to_add: int) -> None:
         """ Allocate qubits.
@@ -257,7 +306,7 @@ class QIBackend(BasicEngine):  # type: ignore
         """
         if self._is_simulation_backend:
             # physical bit to add cannot be allocated already
-            if next(iter(x for x in self._allocation_map if x[1] == index_to_add), None) is not None:
+            if index_to_add in self._simulated_positions:
                 raise RuntimeError(f"Bit {index_to_add} is already allocated.")
 
             # check if the corresponding simulation bit is in the _allocation_map already,
@@ -284,11 +333,12 @@ class QIBackend(BasicEngine):  # type: ignore
 
                     # to reuse a de-allocated bit we do a prep_z first, which is better implemented as a
                     # measurement and binary controlled x-gate
-                    self._qasm += f"\nmeasure q[{allocation_entry[0]}]"
-                    self._qasm += f"\nc-x b[{allocation_entry[0]}], q[{allocation_entry[0]}]"
+                    self._qasm_parts.append(f"measure q[{allocation_entry[0]}]")
+                    self._qasm_parts.append(f"c-x b[{allocation_entry[0]}], q[{allocation_entry[0]}]")
                     index = self._allocation_map.index(allocation_entry)
                     self._allocation_map[index] = (allocation_entry[0], index_to_add)
 
+            self._index_allocation_map()
             # keep track of the maximum qubit id on simulation backend
             self._max_qubit_id = max(self._allocation_map)[0]
         else:
@@ -314,6 +364,7 @@ class QIBackend(BasicEngine):  # type: ignore
             # deallocate the corresponding simulation bit
             index = self._allocation_map.index(allocation_entry)
             self._allocation_map[index] = (allocation_entry[0], -1)
+            self._index_allocation_map()
 
         if self._verbose >= 1:
             print(f'_store: Deallocate gate {(index_to_remove,)}')
@@ -329,26 +380,34 @@ class QIBackend(BasicEngine):  # type: ignore
             Allocated simulation bit position of physical qubit with id pqb_id.
         """
         if self._is_simulation_backend:
-            allocation_entry = next(iter(x for x in self._allocation_map if x[1] == physical_qubit_id), None)
-            if allocation_entry is None:
+            sim_qubit_id = self._simulated_positions.get(physical_qubit_id)
+            if sim_qubit_id is None:
                 raise RuntimeError(f"Bit position in simulation backend not found for"
                                    f" physical bit {physical_qubit_id}.")
-            return allocation_entry[0]
+            return sim_qubit_id
 
         return physical_qubit_id
 
+    def _index_allocation_map(self) -> None:
+        """ Rebuild :attr:`_simulated_positions`, the lookup of simulation bit by physical bit.
+
+        :meth:`_physical_to_simulated` is called for every qubit of every gate, so instead of scanning
+        :attr:`_allocation_map` for each call the allocated entries are indexed once after every (de-)allocation.
+        """
+        self._simulated_positions = {physical_bit: simulation_bit
+                                     for simulation_bit, physical_bit in self._allocation_map if physical_bit != -1}
+
     def _switch_fsp_to_nonfsp(self) -> None:
         """Switch to non-full state projection.
 
         We have determined that the algorithm is non-deterministic and cannot use fsp.
         At this point, :attr:`_measured_ids` is the collection of measurement statements in the algorithm for which no
         measurement statement has been added to the qasm yet.
-        For every `measured_id` a measurement statement is added.
+        For every `measured_id` a measurement statement is added. No gates were applied in between these
+        measurements, so a qubit that was measured more than once only needs a single measurement statement.
         """
-        for logical_qubit_id in self._measured_ids:
-            physical_qubit_id = self._logical_to_physical(logical_qubit_id)
-            sim_qubit_id = self._physical_to_simulated(physical_qubit_id)
-            self._qasm += f"\nmeasure q[{sim_qubit_id}]"
+        sim_qubit_ids = dict.fromkeys(self._logical_to_simulated_ids(self._measured_ids))
+        self._qasm_parts.extend([f"measure q[{sim_qubit_id}]" for sim_qubit_id in sim_qubit_ids])
         self._full_state_projection = False
 
     def _store(self, cmd: Command) -> None:
@@ -363,14 +422,15 @@ class QIBackend(BasicEngine):  # type: ignore
 
         if self._clear:
             self._clear = False
-            self._qasm = ""
+            self._qasm_parts = []
             self._measured_states = {}
             self._measured_ids = []
             self._full_state_projection = not self._backend_type["is_hardware_backend"]
 
         gate = cmd.gate
 
-        if gate == Deallocate:
+        # mappers send their own (de-)allocate gate instances, so check the type instead of calling __eq__
+        if isinstance(gate, DeallocateQubitGate):
             index_to_remove = cmd.qubits[0][0].id
             self._deallocate_qubit(index_to_remove)
             return
@@ -378,7 +438,7 @@ class QIBackend(BasicEngine):  # type: ignore
         if self._flushed:
             raise RuntimeError("Same instance of QIBackend used for circuit after Flush.")
 
-        if gate == Allocate:
+        if isinstance(gate, AllocateQubitGate):
             index_to_add = cmd.qubits[0][0].id
             self._allocate_qubit(index_to_add)
             return
@@ -398,7 +458,7 @@ class QIBackend(BasicEngine):  # type: ignore
             # do not add the measurement statement when fsp is possible
             if not self._full_state_projection:
                 if self._is_simulation_backend:
-                    self._qasm += f"\nmeasure q[{sim_qubit_id}]"
+                    self._qasm_parts.append(f"measure q[{sim_qubit_id}]")
             return
 
         # when we find a gate after measurements we don't have fsp
@@ -406,53 +466,82 @@ class QIBackend(BasicEngine):  # type: ignore
         if self._full_state_projection and len(self._measured_ids) != 0:
             self._switch_fsp_to_nonfsp()
 
-        if gate == NOT and get_control_count(cmd) == 1:
-            # this case also covers the CX controlled gate
-            ctrl_pos = self._physical_to_simulated(cmd.control_qubits[0].id)
-            qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
-            self._qasm += f"\ncnot q[{ctrl_pos}], q[{qb_pos}]"
-        elif gate == Swap:
-            q0 = self._physical_to_simulated(cmd.qubits[0][0].id)
-            q1 = self._physical_to_simulated(cmd.qubits[1][0].id)
-            self._qasm += f"\nswap q[{q0}], q[{q1}]"
-        elif gate == X and get_control_count(cmd) == 2:
-            ctrl_pos1 = self._physical_to_simulated(cmd.control_qubits[0].id)
-            ctrl_pos2 = self._physical_to_simulated(cmd.control_qubits[1].id)
-            qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
-            self._qasm += f"\ntoffoli q[{ctrl_pos1}], q[{ctrl_pos2}], q[{qb_pos}]"
-        elif gate == Z and get_control_count(cmd) == 1:
-            ctrl_pos = self._physical_to_simulated(cmd.control_qubits[0].id)
-            qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
-            self._qasm += f"\ncz q[{ctrl_pos}], q[{qb_pos}]"
-        elif gate == Barrier:
-            qb_pos_list = [qb.id for qr in cmd.qubits for qb in qr]
-            qb_str = ', '.join([f'q[{self._physical_to_simulated(x)}]' for x in qb_pos_list])
-            self._qasm += f"\n# barrier gate {qb_str};"
-        elif isinstance(gate, (Rz, R)) and get_control_count(cmd) == 1:
-            ctrl_pos = self._physical_to_simulated(cmd.control_qubits[0].id)
-            qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
-            gate_name = 'cr'
-            self._qasm += f"\n{gate_name} q[{ctrl_pos}],q[{qb_pos}],{gate.angle:.12f}"
-        elif isinstance(gate, (Rx, Ry)) and get_control_count(cmd) == 1:
-            raise NotImplementedError('controlled Rx or Ry gate not implemented')
-        elif isinstance(gate, (Rx, Ry, Rz)):
-            assert get_control_count(cmd) == 0
-            qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
-            gate_name = str(gate)[0:2].lower()
-            self._qasm += f"\n{gate_name} q[{qb_pos}],{gate.angle:.12g}"
-        elif gate == Tdag and get_control_count(cmd) == 0:
-            qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
-            self._qasm += f"\ntdag q[{qb_pos}]"
-        elif gate == Sdag and get_control_count(cmd) == 0:
-            qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
-            self._qasm += f"\nsdag q[{qb_pos}]"
-        elif isinstance(gate, tuple(type(gate) for gate in (X, Y, Z, H, S, T))):
-            assert get_control_count(cmd) == 0
-            gate_str = str(gate).lower()
-            qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
-            self._qasm += f"\n{gate_str} q[{qb_pos}]"
-        else:
+        if gate == Barrier:
+            # a barrier is emitted whatever the number of control qubits it picked up (e.g. inside a Control block)
+            self._store_barrier(cmd)
+            return
+
+        key = (type(gate) if isinstance(gate, _PARAMETERIZED_GATE_TYPES) else gate, get_control_count(cmd))
+        try:
+            handler = _GATE_HANDLERS.get(key)
+        except TypeError:
+            # unhashable gates, e.g. a ControlledGate, have no translation to cQASM
+            handler = None
+        if handler is None:
             raise NotImplementedError(f'cmd {(cmd,)} not implemented')
+        handler(self, cmd)
+
+    @_gate_handler((NOT, 1))
+    def _store_cnot(self, cmd: Command) -> None:
+        # this case also covers the CX controlled gate
+        ctrl_pos = self._physical_to_simulated(cmd.control_qubits[0].id)
+        qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
+        self._qasm_parts.append(f"cnot q[{ctrl_pos}], q[{qb_pos}]")
+
+    @_gate_handler((Swap, 0))
+    def _store_swap(self, cmd: Command) -> None:
+        q0 = self._physical_to_simulated(cmd.qubits[0][0].id)
+        q1 = self._physical_to_simulated(cmd.qubits[1][0].id)
+        self._qasm_parts.append(f"swap q[{q0}], q[{q1}]")
+
+    @_gate_handler((X, 2))
+    def _store_toffoli(self, cmd: Command) -> None:
+        ctrl_pos1 = self._physical_to_simulated(cmd.control_qubits[0].id)
+        ctrl_pos2 = self._physical_to_simulated(cmd.control_qubits[1].id)
+        qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
+        self._qasm_parts.append(f"toffoli q[{ctrl_pos1}], q[{ctrl_pos2}], q[{qb_pos}]")
+
+    @_gate_handler((Z, 1))
+    def _store_cz(self, cmd: Command) -> None:
+        ctrl_pos = self._physical_to_simulated(cmd.control_qubits[0].id)
+        qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
+        self._qasm_parts.append(f"cz q[{ctrl_pos}], q[{qb_pos}]")
+
+    def _store_barrier(self, cmd: Command) -> None:
+        qb_str = ', '.join([f'q[{self._physical_to_simulated(qb.id)}]' for qr in cmd.qubits for qb in qr])
+        self._qasm_parts.append(f"# barrier gate {qb_str};")
+
+    @_gate_handler((Rz, 1), (R, 1))
+    def _store_cr(self, cmd: Command) -> None:
+        ctrl_pos = self._physical_to_simulated(cmd.control_qubits[0].id)
+        qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
+        self._qasm_parts.append(f"cr q[{ctrl_pos}],q[{qb_pos}],{cmd.gate.angle:.12f}")
+
+    @_gate_handler((Rx, 1), (Ry, 1))
+    def _store_controlled_rx_ry(self, cmd: Command) -> None:
+        raise NotImplementedError('controlled Rx or Ry gate not implemented')
+
+    @_gate_handler((Rx, 0), (Ry, 0), (Rz, 0))
+    def _store_rotation(self, cmd: Command) -> None:
+        qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
+        gate_name = _GATE_NAMES[type(cmd.gate)]
+        self._qasm_parts.append(f"{gate_name} q[{qb_pos}],{cmd.gate.angle:.12g}")
+
+    @_gate_handler((Tdag, 0))
+    def _store_tdag(self, cmd: Command) -> None:
+        qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
+        self._qasm_parts.append(f"tdag q[{qb_pos}]")
+
+    @_gate_handler((Sdag, 0))
+    def _store_sdag(self, cmd: Command) -> None:
+        qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
+        self._qasm_parts.append(f"sdag q[{qb_pos}]")
+
+    @_gate_handler((X, 0), (Y, 0), (Z, 0), (H, 0), (S, 0), (T, 0))
+    def _store_single_qubit_gate(self, cmd: Command) -> None:
+        gate_str = _GATE_NAMES[type(cmd.gate)]
+        qb_pos = self._physical_to_simulated(cmd.qubits[0][0].id)
+        self._qasm_parts.append(f"{gate_str} q[{qb_pos}]")
 
     def _logical_to_physical(self, logical_qubit_id: int) -> int:
         """Return the physical location of the qubit with the given logical id.
@@ -462,16 +551,41 @@ class QIBackend(BasicEngine):  # type: ignore
         :return:
             Physical position of logical qubit with id qb_id.
         """
-        if self.main_engine.mapper is not None:
-            mapping = self.main_engine.mapper.current_mapping
+        return self._logical_to_physical_ids([logical_qubit_id])[0]
+
+    def _logical_to_physical_ids(self, logical_qubit_ids: Iterable[int]) -> List[int]:
+        """Return the physical locations of the qubits with the given logical ids.
+
+        The current mapping of the mapper is fetched once for all ids.
+
+        :param logical_qubit_ids: IDs of the logical qubits whose positions should be returned.
+
+        :return:
+            Physical positions of the logical qubits, in the order of `logical_qubit_ids`.
+        """
+        if self.main_engine.mapper is None:
+            return list(logical_qubit_ids)  # no mapping
+
+        mapping = self.main_engine.mapper.current_mapping
+        physical_qubit_ids = []
+        for logical_qubit_id in logical_qubit_ids:
             if logical_qubit_id not in mapping:
                 raise RuntimeError(f"Unknown qubit id {logical_qubit_id}. Please make sure "
                                    f"eng.flush() was called and that the qubit "
                                    f"was eliminated during optimization.")
+            physical_qubit_ids.append(int(mapping[logical_qubit_id]))
+        return physical_qubit_ids
 
-            return int(mapping[logical_qubit_id])
+    def _logical_to_simulated_ids(self, logical_qubit_ids: Iterable[int]) -> List[int]:
+        """Return the allocated locations on the simulated backend of the qubits with the given logical ids.
 
-        return logical_qubit_id  # no mapping
+        :param logical_qubit_ids: IDs of the logical qubits whose positions should be returned.
+
+        :return:
+            Simulation bit positions of the logical qubits, in the order of `logical_qubit_ids`.
+        """
+        return [self._physical_to_simulated(physical_qubit_id)
+                for physical_qubit_id in self._logical_to_physical_ids(logical_qubit_ids)]
 
     def get_probabilities(self, qureg: List[Qubit]) -> Dict[str, float]:
         """Return the list of basis states with corresponding probabilities.
@@ -494,53 +608,43 @@ class QIBackend(BasicEngine):  # type: ignore
         """
         if len(self._measured_states) == 0:
             raise RuntimeError("Please, run the circuit first!")
-        mask_bits = map(lambda qubit: self._physical_to_simulated(self._logical_to_physical(qubit.id)), qureg)
+        sim_qubit_ids = self._logical_to_simulated_ids(qubit.id for qubit in qureg)
 
-        filtered_states = QIBackend._filter_histogram(self._measured_states, mask_bits)
+        filtered_states = QIBackend._filter_histogram(self._measured_states, iter(sim_qubit_ids))
 
-        probability_dict = {self._map_state_to_bit_string(state, qureg): probability
+        probability_dict = {QIBackend._map_state_to_bit_string(state, sim_qubit_ids): probability
                             for state, probability in filtered_states.items()}
 
         return probability_dict
 
-    def _map_state_to_bit_string(self, state: int, qureg: List[Qubit]) -> str:
+    @staticmethod
+    def _map_state_to_bit_string(state: int, sim_qubit_ids: List[int]) -> str:
         """ Map the state to a bit string
 
         :param state: state represented as an integer number.
-        :param qureg: list of qubits for which to extract the state bit.
+        :param sim_qubit_ids: list of simulation bit positions for which to extract the state bit.
 
         :return:
-            A string of ``0`` and ``1`` corresponding to the bit value in state of each Qubit in qureg.
+            A string of ``0`` and ``1`` corresponding to the bit value in state of each position in sim_qubit_ids.
 
         Example:
 
         .. code-block::
 
             >>> state = int('0b101010', 2)
-            >>> qureg = [Qubit(0), Qubit(1), Qubit(5)]
-            >>> print(self._map_state_to_bit_string(state, qureg)
+            >>> sim_qubit_ids = [0, 1, 5]
+            >>> print(QIBackend._map_state_to_bit_string(state, sim_qubit_ids)
             011
 
         """
-        mapped_state = ''
-
-        for qubit in qureg:
-            logical_id = qubit.id
-            physical_qubit_id = self._logical_to_physical(logical_id)
-            sim_qubit_id = self._physical_to_simulated(physical_qubit_id)
-            if int(state) & (1 << sim_qubit_id):
-                mapped_state += '1'
-            else:
-                mapped_state += '0'
-
-        return mapped_state
+        return ''.join('1' if int(state) & (1 << sim_qubit_id) else '0' for sim_qubit_id in sim_qubit_ids)
 
     def _run(self) -> None:
         """ Run the circuit.
 
         Send the circuit via the Quantum Inspire API.
         """
-        if self._qasm == "":
+        if not self._qasm_parts:
             return
 
         # Finally: add measurement commands for all measured qubits if no measurements are given.
@@ -556,9 +660,7 @@ class QIBackend(BasicEngine):  # type: ignore
 
     def _finalize_qasm(self) -> None:
         """ Finalize qasm (add version and qubits line). """
-        qasm = f'version 1.0\n# cQASM generated by Quantum Inspire {self.__class__} class\n' \
-               f'qubits {self._number_of_qubits}\n'
-        qasm += self._qasm
+        qasm = _cqasm_header(self.__class__, self._number_of_qubits) + self.qasm
 
         if self._verbose >= 2:
             print(qasm)
@@ -589,7 +691,7 @@ class QIBackend(BasicEngine):  # type: ignore
         Populates :attr:`_measured_states` by filtering :attr:`_quantum_inspire_result['histogram']` based on
         :attr:`_measured_ids` (which are supposed to be logical qubit id's).
         """
-        mask_bits = map(lambda bit: self._physical_to_simulated(self._logical_to_physical(bit)), self._measured_ids)
+        mask_bits = iter(self._logical_to_simulated_ids(self._measured_ids))
         histogram: Dict[int, float] = {int(k): v for k, v in self._quantum_inspire_result['histogram'].items()}
         self._measured_states = QIBackend._filter_histogram(histogram, mask_bits)
 
@@ -617,37 +719,39 @@ class QIBackend(BasicEngine):  # type: ignore
         """
         mask = reduce(lambda x, y: x | (1 << y), mask_bits, 0)
 
-        filtered_states: Dict[int, float] = defaultdict(lambda: 0)
-        for state, probability in histogram.items():
-            filtered_states[state & mask] += probability
+        if len(histogram) < _VECTORIZED_HISTOGRAM_SIZE:
+            filtered_histogram: Dict[int, float] = {}
+            for state, probability in histogram.items():
+                filtered_state = state & mask
+                filtered_histogram[filtered_state] = filtered_histogram.get(filtered_state, 0) + probability
+            return filtered_histogram
 
-        return dict(filtered_states)
+        states = np.fromiter(histogram.keys(), dtype=np.int64, count=len(histogram))
+        probabilities = np.fromiter(histogram.values(), dtype=np.float64, count=len(histogram))
+        filtered_states, inverse = np.unique(states & mask, return_inverse=True)
+        summed_probabilities = np.bincount(inverse.ravel(), weights=probabilities, minlength=len(filtered_states))
+
+        return dict(zip(filtered_states.tolist(), summed_probabilities.tolist()))
 
     def _register_random_measurement_outcome(self) -> None:
         """
         Samples the :attr:`_measured_states` for a single result
         and registers this as the outcome of the circuit. """
-
-        class QB:
-            def __init__(self, qubit_id: int) -> None:
-                self.id: int = qubit_id
-
         random_measurement = self._sample_measured_states_once()
 
-        for logical_qubit_id in self._measured_ids:
-            physical_qubit_id = self._logical_to_physical(logical_qubit_id)
-            sim_qubit_id = self._physical_to_simulated(physical_qubit_id)
-            result = bool(random_measurement & (1 << sim_qubit_id))
-
-            self.main_engine.set_measurement_result(QB(logical_qubit_id), result)
+        sim_qubit_ids = self._logical_to_simulated_ids(self._measured_ids)
+        results = [(_MeasuredQubit(logical_qubit_id), bool(random_measurement & (1 << sim_qubit_id)))
+                   for logical_qubit_id, sim_qubit_id in zip(self._measured_ids, sim_qubit_ids)]
+        for qubit, result in results:
+            self.main_engine.set_measurement_result(qubit, result)
 
     def _sample_measured_states_once(self) -> int:
         """
         Obtain a random state from the :attr:`_measured_states`, taking into account the probability distribution.
         """
         states = list(self._measured_states.keys())
-        weights = list(self._measured_states.values())
-        return random.choices(states, weights=weights)[0]
+        weights = np.fromiter(self._measured_states.values(), dtype=np.float64, count=len(states))
+        return states[self._rng.choice(len(states), p=weights / weights.sum())]
 
     @property
     def _number_of_qubits(self) -> int:
@@ -17,9 +17,12 @@
 
 import io
 import json
+import threading
 import uuid
 from collections import defaultdict, OrderedDict, Counter
-from typing import Dict, List, Tuple, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple, Optional, Any
 
 import numpy as np
 from coreapi.exceptions import ErrorMessage
@@ -38,6 +41,12 @@ from quantuminspire.qiskit.qi_job import QIJob
 from quantuminspire.version import __version__ as quantum_inspire_version
 
 
+@lru_cache(maxsize=32)
+def _cqasm_header(number_of_qubits: int) -> str:
+    """ Return the version, comment and qubits lines that start the cQASM generated for a Qiskit experiment. """
+    return 'version 1.0\n# cQASM generated by QI backend for Qiskit\nqubits %d\n' % number_of_qubits
+
+
 class QuantumInspireBackend(BaseBackend):  # type: ignore
     DEFAULT_CONFIGURATION = QasmBackendConfiguration(
         backend_name='qi_simulator',
@@ -55,6 +64,9 @@ class QuantumInspireBackend(BaseBackend):  # type: ignore
         max_experiments=1,
         coupling_map=None
     )
+    CQASM_CACHE_SIZE = 256
+    # number of results fetched concurrently, set it on the backend instance to fetch more results at a time
+    MAX_CONCURRENT_REQUESTS = 1
 
     def __init__(self, api: QuantumInspireAPI, provider: Any,
                  configuration: Optional[QasmBackendConfiguration] = None) -> None:
@@ -92,6 +104,8 @@ class QuantumInspireBackend(BaseBackend):  # type: ignore
                          provider=provider)
         self.__backend: Dict[str, Any] = api.get_backend_type_by_name(self.name())
         self.__api: QuantumInspireAPI = api
+        self.__cqasm_cache: 'OrderedDict[Tuple[Any, ...], str]' = OrderedDict()
+        self.__cqasm_cache_lock = threading.Lock()
 
     @property
     def backend_name(self) -> str:
@@ -130,6 +144,39 @@ class QuantumInspireBackend(BaseBackend):  # type: ignore
         job.experiments = experiments
         return job
 
+    def _map_concurrently(self, function: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """ Applies a function, that calls the Quantum Inspire API, to each of the items.
+
+        The API calls are I/O bound, so up to :attr:`MAX_CONCURRENT_REQUESTS` of them are run concurrently in
+        separate threads; by default they are made one after the other. The order in which the calls reach the
+        server is not defined, so only use this for calls that do not create anything on the server, e.g. fetching
+        results. As in a sequential loop, no new calls are started after a call raised an exception; the exception is
+        re-raised once the calls that were already running have finished.
+
+        :param function: The function to call for each item.
+        :param items: The items to call the function with.
+
+        :return:
+            The return values of the function, in the order of the items.
+        """
+        if len(items) <= 1 or self.MAX_CONCURRENT_REQUESTS <= 1:
+            return [function(item) for item in items]
+        failed = threading.Event()
+
+        def call(item: Any) -> Any:
+            # items are started in order, so a skipped item always comes after the failed one and its result is
+            # never returned
+            if failed.is_set():
+                return None
+            try:
+                return function(item)
+            except Exception:
+                failed.set()
+                raise
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(items))) as executor:
+            return list(executor.map(call, items))
+
     def retrieve_job(self, job_id: str) -> QIJob:
         """ Retrieve a specified job by its job_id.
 
@@ -160,17 +207,65 @@ class QuantumInspireBackend(BaseBackend):  # type: ignore
         number_of_qubits = experiment.header.n_qubits
         instructions = experiment.instructions
         with io.StringIO() as stream:
-            stream.write('version 1.0\n')
-            stream.write('# cQASM generated by QI backend for Qiskit\n')
-            stream.write('qubits %d\n' % number_of_qubits)
+            stream.write(_cqasm_header(number_of_qubits))
             for instruction in instructions:
                 parser.parse(stream, instruction)
             return stream.getvalue()
 
+    @staticmethod
+    def _experiment_signature(experiment: QasmQobjExperiment, full_state_projection: bool = True) -> Tuple[Any, ...]:
+        """ Returns a key of the parts of the experiment that determine the generated cQASM.
+
+        The key is built from the instruction attributes that are read by the circuit parser, so it is much cheaper
+        to build than the cQASM itself.
+
+        :param experiment: The experiment that contains instructions to be converted to cQASM.
+        :param full_state_projection: When False, the experiment is not suitable for full state projection
+
+        :return:
+            The number of qubits, the full state projection flag and for each instruction its name, qubits,
+            parameters and conditional (bfunc) attributes.
+        """
+        instructions = tuple((instruction.name, tuple(getattr(instruction, 'qubits', ())),
+                              tuple(getattr(instruction, 'params', ())), getattr(instruction, 'conditional', None),
+                              getattr(instruction, 'register', None), getattr(instruction, 'relation', None),
+                              getattr(instruction, 'mask', None), getattr(instruction, 'val', None))
+                             for instruction in experiment.instructions)
+        return experiment.header.n_qubits, full_state_projection, instructions
+
+    def _get_cqasm(self, experiment: QasmQobjExperiment, full_state_projection: bool = True) -> str:
+        """ Returns the cQASM for the Qiskit experiment, reusing the cQASM of an identical earlier experiment.
+
+        The generated cQASM of the last :attr:`CQASM_CACHE_SIZE` distinct experiments is kept, so circuits that are
+        submitted repeatedly (e.g. in an optimization loop) are only translated once. The cache is guarded by a
+        lock, because :meth:`run` submits experiments from several threads.
+
+        :param experiment: The experiment that contains instructions to be converted to cQASM.
+        :param full_state_projection: When False, the experiment is not suitable for full state projection
+
+        :return:
+            The cQASM code that can be sent to the Quantum Inspire API.
+        """
+        signature = self._experiment_signature(experiment, full_state_projection)
+        with self.__cqasm_cache_lock:
+            try:
+                compiled_qasm = self.__cqasm_cache.get(signature)
+            except TypeError:
+                # experiments with unhashable instruction parameters are not cached
+                return self._generate_cqasm(experiment, full_state_projection=full_state_projection)
+            if compiled_qasm is None:
+                compiled_qasm = self._generate_cqasm(experiment, full_state_projection=full_state_projection)
+                self.__cqasm_cache[signature] = compiled_qasm
+                if len(self.__cqasm_cache) > self.CQASM_CACHE_SIZE:
+                    self.__cqasm_cache.popitem(last=False)
+            else:
+                self.__cqasm_cache.move_to_end(signature)
+        return compiled_qasm
+
     def _submit_experiment(self, experiment: QasmQobjExperiment, number_of_shots: int,
                            project: Optional[Dict[str, Any]] = None,
                            full_state_projection: bool = True) -> QuantumInspireJob:
-        compiled_qasm = self._generate_cqasm(experiment, full_state_projection=full_state_projection)
+        compiled_qasm = self._get_cqasm(experiment, full_state_projection=full_state_projection)
         measurements = self._collect_measurements(experiment)
         user_data = {'name': experiment.header.name, 'memory_slots': experiment.header.memory_slots,
                      'creg_sizes': experiment.header.creg_sizes, 'measurements': measurements}
@@ -191,7 +286,7 @@ class QuantumInspireBackend(BaseBackend):  # type: ignore
         :return:
             A list of experiment results; containing the data, execution time, status, etc. for the list of jobs.
         """
-        results = [self.__api.get_result_from_job(job['id']) for job in jobs]
+        results = self._map_concurrently(lambda job: self.__api.get_result_from_job(job['id']), jobs)
         experiment_results = []
         for result, job in zip(results, jobs):
             if not result.get('histogram', {}):
@@ -448,23 +543,21 @@ class QuantumInspireBackend(BaseBackend):  # type: ignore
         number_of_qubits: int = result['number_of_qubits']
         raw_data = self.__api.get_raw_data_from_result(result['id'])
         if raw_data:
-            for raw_qubit_register in raw_data:
-                classical_state_hex = QuantumInspireBackend.__qubit_to_classical_hex(str(raw_qubit_register),
-                                                                                     measurements, number_of_qubits)
-                memory_data.append(classical_state_hex)
+            classical_states_hex = {raw_qubit_register: QuantumInspireBackend.__qubit_to_classical_hex(
+                str(raw_qubit_register), measurements, number_of_qubits) for raw_qubit_register in set(raw_data)}
+            memory_data = [classical_states_hex[raw_qubit_register] for raw_qubit_register in raw_data]
             histogram_data = {elem: count for elem, count in Counter(memory_data).items()}
         else:
             state_probabilities = result['histogram']
+            qubit_registers = list(state_probabilities.keys())
+            cumulative_probabilities = np.cumsum(list(state_probabilities.values()))
             random_probability = np.random.rand()
-            sum_probability = 0.0
-            for qubit_register, probability in state_probabilities.items():
-                sum_probability += probability
-                if random_probability < sum_probability:
-                    classical_state_hex = QuantumInspireBackend.__qubit_to_classical_hex(qubit_register, measurements,
-                                                                                         number_of_qubits)
-                    memory_data.append(classical_state_hex)
-                    histogram_data[classical_state_hex] = 1
-                    break
+            index = int(np.searchsorted(cumulative_probabilities, random_probability, side='right'))
+            if index < len(qubit_registers):
+                classical_state_hex = QuantumInspireBackend.__qubit_to_classical_hex(qubit_registers[index],
+                                                                                     measurements, number_of_qubits)
+                memory_data.append(classical_state_hex)
+                histogram_data[classical_state_hex] = 1
 
         sorted_histogram_data: List[Tuple[str, int]] = sorted(histogram_data.items(), key=lambda kv: int(kv[0], 16))
         histogram_obj = OrderedDict(sorted_histogram_data)
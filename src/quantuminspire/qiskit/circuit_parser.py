@@ -17,13 +17,46 @@
 
 import copy
 from io import StringIO
-from typing import Optional, Tuple, List
+from typing import Callable, Dict, Optional, Tuple, List
 
 import numpy as np
 
 from qiskit.qobj import QasmQobjInstruction
 from quantuminspire.exceptions import ApiError
 
+# cQASM statement templates, bound once instead of looking up str.format for every instruction
+_CZ_FORMAT = 'CZ q[{0}], q[{1}]\n'.format
+_C_CZ_FORMAT = 'C-CZ {0}q[{1}], q[{2}]\n'.format
+_CX_FORMAT = 'CNOT q[{0}], q[{1}]\n'.format
+_C_CX_FORMAT = 'C-CNOT {0}q[{1}], q[{2}]\n'.format
+_CCX_FORMAT = 'Toffoli q[{0}], q[{1}], q[{2}]\n'.format
+_C_CCX_FORMAT = 'C-Toffoli {0}q[{1}], q[{2}], q[{3}]\n'.format
+_H_FORMAT = 'H q[{0}]\n'.format
+_C_H_FORMAT = 'C-H {0}q[{1}]\n'.format
+_ID_FORMAT = 'I q[{0}]\n'.format
+_C_ID_FORMAT = 'C-I {0}q[{1}]\n'.format
+_S_FORMAT = 'S q[{0}]\n'.format
+_C_S_FORMAT = 'C-S {0}q[{1}]\n'.format
+_SDG_FORMAT = 'Sdag q[{0}]\n'.format
+_C_SDG_FORMAT = 'C-Sdag {0}q[{1}]\n'.format
+_SWAP_FORMAT = 'SWAP q[{0}], q[{1}]\n'.format
+_C_SWAP_FORMAT = 'C-SWAP {0}q[{1}], q[{2}]\n'.format
+_T_FORMAT = 'T q[{0}]\n'.format
+_C_T_FORMAT = 'C-T {0}q[{1}]\n'.format
+_TDG_FORMAT = 'Tdag q[{0}]\n'.format
+_C_TDG_FORMAT = 'C-Tdag {0}q[{1}]\n'.format
+_X_FORMAT = 'X q[{0}]\n'.format
+_C_X_FORMAT = 'C-X {0}q[{1}]\n'.format
+_Y_FORMAT = 'Y q[{0}]\n'.format
+_C_Y_FORMAT = 'C-Y {0}q[{1}]\n'.format
+_Z_FORMAT = 'Z q[{0}]\n'.format
+_C_Z_FORMAT = 'C-Z {0}q[{1}]\n'.format
+_R_FORMAT = 'R{0} q[{1}], {2:.6f}\n'.format
+_C_R_FORMAT = 'C-R{0} {1}q[{2}], {3:.6f}\n'.format
+_U3_FORMAT = '{0} q[{1}], {2:.6f}\n'.format
+_C_U3_FORMAT = '{0} {1}q[{2}], {3:.6f}\n'.format
+_MEASURE_FORMAT = 'measure q[{0}]\n'.format
+
 
 class CircuitToString:
     """ Contains the translational elements to convert the Qiskit circuits to cQASM code."""
@@ -34,6 +67,27 @@ class CircuitToString:
         """
         self.bfunc_instructions: List[QasmQobjInstruction] = []
         self.full_state_projection = full_state_projection
+        self._gate_functions: Dict[Tuple[str, bool], Callable[..., None]] = {}
+
+    def _get_gate_function(self, name: str, binary_controlled: bool = False) -> Callable[..., None]:
+        """ Returns the method that translates the gate with the given (Qiskit) name.
+
+        The resolved methods are kept per gate name, so the method lookup is done once for each gate type in a
+        circuit instead of once for each instruction. When a gate is not supported _gate_not_supported is returned.
+
+        :param name: The name of the Qiskit instruction.
+        :param binary_controlled: Whether to return the method for the binary-controlled version of the gate.
+
+        :return:
+            The translation method for the gate.
+        """
+        key = (name, binary_controlled)
+        gate_function = self._gate_functions.get(key)
+        if gate_function is None:
+            prefix = '_c_' if binary_controlled else '_'
+            gate_function = getattr(self, f'{prefix}{name.lower()}', getattr(self, "_gate_not_supported"))
+            self._gate_functions[key] = gate_function
+        return gate_function
 
     @staticmethod
     def _gate_not_supported(_stream: StringIO, instruction: QasmQobjInstruction, _binary_control: Optional[str] = None)\
@@ -58,7 +112,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('CZ q[{0}], q[{1}]\n'.format(*instruction.qubits))
+        stream.write(_CZ_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_cz(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -70,7 +124,7 @@ class CircuitToString:
         are 1.
 
         """
-        stream.write('C-CZ {0}q[{1}], q[{2}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_CZ_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _cx(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -80,7 +134,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('CNOT q[{0}], q[{1}]\n'.format(*instruction.qubits))
+        stream.write(_CX_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_cx(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -92,7 +146,7 @@ class CircuitToString:
         are 1.
 
         """
-        stream.write('C-CNOT {0}q[{1}], q[{2}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_CX_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _ccx(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -102,7 +156,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('Toffoli q[{0}], q[{1}], q[{2}]\n'.format(*instruction.qubits))
+        stream.write(_CCX_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_ccx(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -114,7 +168,7 @@ class CircuitToString:
         are 1.
 
         """
-        stream.write('C-Toffoli {0}q[{1}], q[{2}], q[{3}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_CCX_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _h(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -124,7 +178,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('H q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_H_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_h(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -136,7 +190,7 @@ class CircuitToString:
         are 1.
 
         """
-        stream.write('C-H {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_H_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _id(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -146,7 +200,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('I q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_ID_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_id(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -158,7 +212,7 @@ class CircuitToString:
         are 1.
 
         """
-        stream.write('C-I {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_ID_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _s(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -168,7 +222,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('S q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_S_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_s(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -178,7 +232,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('C-S {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_S_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _sdg(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -188,7 +242,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('Sdag q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_SDG_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_sdg(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -198,7 +252,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('C-Sdag {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_SDG_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _swap(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -208,7 +262,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('SWAP q[{0}], q[{1}]\n'.format(*instruction.qubits))
+        stream.write(_SWAP_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_swap(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -218,7 +272,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('C-SWAP {0}q[{1}], q[{2}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_SWAP_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _t(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -228,7 +282,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('T q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_T_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_t(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -238,7 +292,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('C-T {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_T_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _tdg(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -248,7 +302,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('Tdag q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_TDG_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_tdg(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -258,7 +312,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('C-Tdag {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_TDG_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _x(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -268,7 +322,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('X q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_X_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_x(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -278,7 +332,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('C-X {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_X_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _y(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -288,7 +342,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('Y q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_Y_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_y(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -300,7 +354,7 @@ class CircuitToString:
         are 1.
 
         """
-        stream.write('C-Y {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_Y_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _z(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -310,7 +364,7 @@ class CircuitToString:
         :param instruction: The Qiskit instruction to translate to cQASM.
 
         """
-        stream.write('Z q[{0}]\n'.format(*instruction.qubits))
+        stream.write(_Z_FORMAT(*instruction.qubits))
 
     @staticmethod
     def _c_z(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -322,7 +376,7 @@ class CircuitToString:
         are 1.
 
         """
-        stream.write('C-Z {0}q[{1}]\n'.format(binary_control, *instruction.qubits))
+        stream.write(_C_Z_FORMAT(binary_control, *instruction.qubits))
 
     @staticmethod
     def _r(stream: StringIO, instruction: QasmQobjInstruction, axis: str) -> None:
@@ -334,7 +388,7 @@ class CircuitToString:
 
         """
         angle_q0 = float(instruction.params[0])
-        stream.write('R{0} q[{1}], {2:.6f}\n'.format(axis, *instruction.qubits, angle_q0))
+        stream.write(_R_FORMAT(axis, *instruction.qubits, angle_q0))
 
     @staticmethod
     def _c_r(stream: StringIO, instruction: QasmQobjInstruction, axis: str, binary_control: str) -> None:
@@ -348,7 +402,7 @@ class CircuitToString:
 
         """
         angle_q0 = float(instruction.params[0])
-        stream.write('C-R{0} {1}q[{2}], {3:.6f}\n'.format(axis, binary_control, *instruction.qubits, angle_q0))
+        stream.write(_C_R_FORMAT(axis, binary_control, *instruction.qubits, angle_q0))
 
     @staticmethod
     def _rx(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -526,7 +580,7 @@ class CircuitToString:
         index_q0 = [instruction.qubits[0]] * 3
         for triplet in zip(gates, index_q0, angles):
             if triplet[2] != 0:
-                stream.write('{0} q[{1}], {2:.6f}\n'.format(*triplet))
+                stream.write(_U3_FORMAT(*triplet))
 
     @staticmethod
     def _c_u3(stream: StringIO, instruction: QasmQobjInstruction, binary_control: str) -> None:
@@ -546,7 +600,7 @@ class CircuitToString:
         index_q0 = [instruction.qubits[0]] * 3
         for quadruplets in zip(gates, binary_controls, index_q0, angles):
             if quadruplets[3] != 0:
-                stream.write('{0} {1}q[{2}], {3:.6f}\n'.format(*quadruplets))
+                stream.write(_C_U3_FORMAT(*quadruplets))
 
     @staticmethod
     def _barrier(stream: StringIO, instruction: QasmQobjInstruction) -> None:
@@ -576,7 +630,7 @@ class CircuitToString:
 
         """
         if not self.full_state_projection:
-            stream.write('measure q[{0}]\n'.format(*instruction.qubits))
+            stream.write(_MEASURE_FORMAT(*instruction.qubits))
 
     @staticmethod
     def get_mask_data(mask: int) -> Tuple[int, int]:
@@ -668,8 +722,7 @@ class CircuitToString:
 
         with StringIO() as gate_stream:
             # add the gate
-            gate_name = f'_c_{instruction.name.lower()}'
-            gate_function = getattr(self, gate_name, getattr(self, "_gate_not_supported"))
+            gate_function = self._get_gate_function(instruction.name, binary_controlled=True)
             gate_function(gate_stream, instruction, binary_control)
             line = gate_stream.getvalue()
             if len(line) != 0:
@@ -698,6 +751,5 @@ class CircuitToString:
         elif hasattr(instruction, 'conditional'):
             self._parse_bin_ctrl_gate(stream, instruction)
         else:
-            gate_name = f'_{instruction.name.lower()}'
-            gate_function = getattr(self, gate_name, getattr(self, "_gate_not_supported"))
+            gate_function = self._get_gate_function(instruction.name)
             gate_function(stream, instruction)
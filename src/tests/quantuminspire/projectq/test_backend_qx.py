@@ -24,8 +24,8 @@ from collections import OrderedDict
 from unittest.mock import MagicMock, patch
 
 from projectq.meta import LogicalQubitIDTag
-from projectq.ops import (CNOT, NOT, Allocate, Barrier,
-                          Deallocate, FlushGate, H, Measure,
+from projectq.ops import (CNOT, NOT, Allocate, AllocateQubitGate, Barrier,
+                          Deallocate, DeallocateQubitGate, FlushGate, H, Measure,
                           Ph, Rx, Ry, Rz, S, Sdag, Swap, T, Tdag, Toffoli, X,
                           Y, Z, R)
 
@@ -111,6 +111,7 @@ class QIBackendNonProtected(QIBackend):
     @allocation_map.setter
     def allocation_map(self, x):
         self._allocation_map = x
+        self._index_allocation_map()
 
     @property
     def measured_ids(self):
@@ -122,11 +123,11 @@ class QIBackendNonProtected(QIBackend):
 
     @property
     def qasm(self):
-        return self._qasm
+        return QIBackend.qasm.fget(self)
 
     @qasm.setter
     def qasm(self, x):
-        self._qasm = x
+        self._qasm_parts = [line for line in x.split('\n') if line]
 
     @property
     def number_of_qubits(self):
@@ -289,6 +290,7 @@ class TestProjectQBackend(unittest.TestCase):
         self.__store_function_assert_equal(1, X, "\ntoffoli q[0], q[1], q[1]", count=2)
         self.__store_function_assert_equal(1, Z, "\ncz q[0], q[1]", count=1)
         self.__store_function_assert_equal(0, Barrier, "\n# barrier gate q[0], q[1];")
+        self.__store_function_assert_equal(1, Barrier, "\n# barrier gate q[1], q[2];", count=1)
         self.__store_function_assert_equal(1, Rz(angle), "\ncr q[0],q[1],{0:.12f}".format(angle), count=1)
         self.__store_function_assert_equal(1, R(angle), "\ncr q[0],q[1],{0:.12f}".format(angle), count=1)
         self.__store_function_assert_equal(1, Rx(angle), "\nrx q[1],{0}".format(angle))
@@ -359,6 +361,7 @@ class TestProjectQBackend(unittest.TestCase):
     def test_store_raises_error(self):
         angle = 0.1
         self.__store_function_raises_error(Toffoli, count=0)
+        self.__store_function_raises_error(Swap, count=1)
         self.__store_function_raises_error(Rx(angle), count=1)
         self.__store_function_raises_error(Ry(angle), count=1)
 
@@ -419,6 +422,18 @@ class TestProjectQBackend(unittest.TestCase):
         self.assertEqual(self.qi_backend.qasm, "\nmeasure q[20]\nh q[0]")
         self.assertEqual(self.qi_backend.full_state_projection, False)
 
+    @patch('quantuminspire.projectq.backend_qx.get_control_count')
+    def test_store_repeated_measure_gate_is_added_once(self, function_mock):
+        function_mock.return_value = 0
+        self.qi_backend.main_engine = MagicMock(mapper=None)
+        self.__store_function(self.qi_backend, 0, Allocate)
+        self.__store_function(self.qi_backend, 1, Allocate)
+        command = [MagicMock(gate=Measure, qubits=[[MagicMock(id=qubit_id)]], tags=[]) for qubit_id in [1, 0, 1]]
+        self.qi_backend.receive(command)
+        self.__store_function(self.qi_backend, 0, H)
+        self.assertEqual(self.qi_backend.measured_ids, [1, 0, 1])
+        self.assertEqual(self.qi_backend.qasm, "\nmeasure q[1]\nmeasure q[0]\nh q[0]")
+
     def test_logical_to_physical_with_mapper_returns_correct_result(self):
         qd_id = 0
         expected = 1234
@@ -470,6 +485,45 @@ class TestProjectQBackend(unittest.TestCase):
         actual = self.qi_backend.get_probabilities([MagicMock(id=0), MagicMock(id=2)])
         self.assertDictEqual(expected, actual)
 
+    def test_filter_histogram_collapses_masked_states(self):
+        histogram = {0: 0.125, 2: 0.25, 5: 0.375, 7: 0.25}  # 000, 010, 101 and 111
+        expected = {0: 0.375, 5: 0.625}
+        actual = QIBackend._filter_histogram(histogram, iter([0, 2]))
+        self.assertDictEqual(expected, actual)
+        self.assertDictEqual({}, QIBackend._filter_histogram({}, iter([0])))
+
+    def test_filter_histogram_collapses_masked_states_of_large_histogram(self):
+        histogram = {state: 1 / 2048 for state in range(2048)}
+        expected = {0: 0.25, 1: 0.25, 4: 0.25, 5: 0.25}
+        actual = QIBackend._filter_histogram(histogram, iter([0, 2]))
+        self.assertDictEqual(expected, actual)
+
+    def test_register_random_measurement_outcome(self):
+        self.qi_backend.measured_states = {2: 1.0}  # 010
+        self.qi_backend.main_engine = MagicMock()
+        self.qi_backend.main_engine.mapper.current_mapping = {4: 0, 7: 1}
+        self.qi_backend.measured_ids = [4, 7]
+        self.qi_backend.allocation_map = [(0, 0), (1, 1)]
+        self.qi_backend._register_random_measurement_outcome()
+        calls = self.qi_backend.main_engine.set_measurement_result.call_args_list
+        self.assertEqual([(call[0][0].id, call[0][1]) for call in calls], [(4, False), (7, True)])
+
+    def test_sample_measured_states_once(self):
+        self.qi_backend.measured_states = {1: 0.0, 3: 0.5, 6: 0.0}
+        self.assertEqual(3, self.qi_backend._sample_measured_states_once())
+        self.qi_backend.measured_states = {1: 0.25, 3: 0.0, 6: 0.25}
+        self.assertIn(self.qi_backend._sample_measured_states_once(), (1, 6))
+
+    def test_sample_measured_states_once_with_seed_is_deterministic(self):
+        measured_states = {state: 1 / 16 for state in range(16)}
+        samples = []
+        for _ in range(2):
+            backend = QIBackendNonProtected(quantum_inspire_api=self.api, seed=42)
+            backend.measured_states = measured_states
+            samples.append([backend._sample_measured_states_once() for _ in range(20)])
+        self.assertEqual(samples[0], samples[1])
+        self.assertGreater(len(set(samples[0])), 1)
+
     @patch('quantuminspire.projectq.backend_qx.get_control_count')
     def test_receive(self, function_mock):
         function_mock.return_value = 1
@@ -780,6 +834,21 @@ class TestProjectQBackend(unittest.TestCase):
         self.assertEqual(self.qi_backend.qasm, "\nmeasure q[1]\nh q[0]")
         self.assertEqual(self.qi_backend.full_state_projection, False)
 
+    @patch('quantuminspire.projectq.backend_qx.get_control_count')
+    def test_store_reuse_of_bit_by_mapper_allocate_gates(self, function_mock):
+        function_mock.return_value = 0
+        self.qi_backend.main_engine = MagicMock(mapper=None)
+        self.qi_backend.max_number_of_qubits = 3
+        # mappers send new instances of the allocate and deallocate gates instead of the module singletons
+        command_list = [MagicMock(gate=AllocateQubitGate(), qubits=[[MagicMock(id=index)]]) for index in range(3)]
+        command_list += [MagicMock(gate=DeallocateQubitGate(), qubits=[[MagicMock(id=1)]]),
+                         MagicMock(gate=AllocateQubitGate(), qubits=[[MagicMock(id=5)]]),
+                         MagicMock(gate=H, qubits=[[MagicMock(id=5)]])]
+        self.qi_backend.receive(command_list)
+        self.assertEqual(self.qi_backend.allocation_map, [(0, 0), (1, 5), (2, 2)])
+        self.assertEqual(self.qi_backend.qasm, "\nmeasure q[1]\nc-x b[1], q[1]\nh q[1]")
+        self.assertEqual(self.qi_backend.full_state_projection, False)
+
     def test_run_no_qasm(self):
         self.qi_backend.run()
         self.assertEqual(self.qi_backend.qasm, "")
@@ -539,6 +539,98 @@ class TestQiSimulatorPy(unittest.TestCase):
             backend.retrieve_job('wrong')
         self.assertEqual(("Could not retrieve job with job_id 'wrong' ",), error.exception.args)
 
+    def test_run_submits_all_experiments_in_order(self):
+        api = Mock()
+        project = {'id': 42}
+        api.create_project.return_value = project
+        api.get_backend_type_by_name.return_value = {'max_number_of_shots': 4096}
+        submitted_jobs = [Mock(name='job{}'.format(index)) for index in range(5)]
+        for submitted_job in submitted_jobs:
+            submitted_job.get_project_identifier.return_value = 42
+        qobj_dict = self._basic_qobj_dictionary
+        qobj_dict['experiments'] = [dict(qobj_dict['experiments'][0]) for _ in range(5)]
+        for index, experiment in enumerate(qobj_dict['experiments']):
+            experiment['instructions'] = [{'name': 'x', 'qubits': [index % 2]}]
+        qobj = QasmQobj.from_dict(qobj_dict)
+        experiment_jobs = dict(zip([id(experiment) for experiment in qobj.experiments], submitted_jobs))
+        with patch.object(QuantumInspireBackend, "_submit_experiment",
+                          side_effect=lambda experiment, *args, **kwargs: experiment_jobs[id(experiment)]):
+            simulator = QuantumInspireBackend(api, Mock())
+            job = simulator.run(qobj)
+        self.assertEqual(submitted_jobs, job.jobs)
+        self.assertEqual('42', job.job_id())
+        api.delete_project.assert_not_called()
+
+    def test_map_concurrently_keeps_order(self):
+        simulator = QuantumInspireBackend(Mock(), Mock())
+        self.assertEqual([0, 2, 4, 6], simulator._map_concurrently(lambda item: 2 * item, [0, 1, 2, 3]))
+        simulator.MAX_CONCURRENT_REQUESTS = 4
+        self.assertEqual([0, 2, 4, 6], simulator._map_concurrently(lambda item: 2 * item, [0, 1, 2, 3]))
+
+    def test_map_concurrently_stops_after_failure(self):
+        simulator = QuantumInspireBackend(Mock(), Mock())
+        called = []
+
+        def function(item):
+            called.append(item)
+            if item == 1:
+                raise ValueError('submission failed')
+            return item
+
+        self.assertRaisesRegex(ValueError, 'submission failed', simulator._map_concurrently, function, [0, 1, 2, 3])
+        self.assertEqual([0, 1], called)
+
+    def test_run_submits_identical_experiments_separately(self):
+        api = Mock()
+        api.create_project.return_value = {'id': 42}
+        api.get_backend_type_by_name.return_value = {'max_number_of_shots': 4096}
+        api.execute_qasm_async.return_value.get_project_identifier.return_value = 42
+        qobj_dict = self._basic_qobj_dictionary
+        qobj_dict['experiments'] = [dict(qobj_dict['experiments'][0]) for _ in range(4)]
+        for index, experiment in enumerate(qobj_dict['experiments']):
+            experiment['instructions'] = [{'name': 'x', 'qubits': [int(index == 3)]}]
+        qobj = QasmQobj.from_dict(qobj_dict)
+        with patch.object(QuantumInspireBackend, '_generate_cqasm', side_effect=['cqasm1', 'cqasm2']) as generate:
+            simulator = QuantumInspireBackend(api, Mock())
+            job = simulator.run(qobj)
+        self.assertEqual(2, generate.call_count)
+        self.assertEqual(4, api.execute_qasm_async.call_count)
+        self.assertEqual(['cqasm1', 'cqasm1', 'cqasm1', 'cqasm2'],
+                         [call[0][0] for call in api.execute_qasm_async.call_args_list])
+        self.assertEqual(4, len(job.jobs))
+
+    def test_get_cqasm_reuses_cqasm_of_identical_experiment(self):
+        simulator = QuantumInspireBackend(Mock(), Mock())
+        instructions = [{'name': 'h', 'qubits': [0]},
+                        {'name': 'cx', 'qubits': [0, 1]}]
+        experiment = self._instructions_to_two_qubit_experiment(instructions)
+        same_experiment = self._instructions_to_two_qubit_experiment(instructions)
+        other_experiment = self._instructions_to_two_qubit_experiment([{'name': 'x', 'qubits': [0]}])
+        with patch.object(QuantumInspireBackend, '_generate_cqasm', side_effect=['cqasm1', 'cqasm2']) as generate:
+            self.assertEqual('cqasm1', simulator._get_cqasm(experiment))
+            self.assertEqual('cqasm1', simulator._get_cqasm(same_experiment))
+            self.assertEqual('cqasm2', simulator._get_cqasm(other_experiment))
+        self.assertEqual(2, generate.call_count)
+
+    def test_get_cqasm_does_not_cache_unhashable_experiment(self):
+        simulator = QuantumInspireBackend(Mock(), Mock())
+        experiment = self._instructions_to_two_qubit_experiment([{'name': 'u3', 'qubits': [0],
+                                                                  'params': [[0.1], 0.2, 0.3]}])
+        with patch.object(QuantumInspireBackend, '_generate_cqasm', side_effect=['cqasm1', 'cqasm2']) as generate:
+            self.assertEqual('cqasm1', simulator._get_cqasm(experiment))
+            self.assertEqual('cqasm2', simulator._get_cqasm(experiment))
+        self.assertEqual(2, generate.call_count)
+
+    def test_get_cqasm_cache_is_bounded(self):
+        simulator = QuantumInspireBackend(Mock(), Mock())
+        simulator.CQASM_CACHE_SIZE = 1
+        experiment = self._instructions_to_two_qubit_experiment([{'name': 'h', 'qubits': [0]}])
+        other_experiment = self._instructions_to_two_qubit_experiment([{'name': 'x', 'qubits': [0]}])
+        with patch.object(QuantumInspireBackend, '_generate_cqasm', side_effect=['cqasm1', 'cqasm2', 'cqasm3']):
+            simulator._get_cqasm(experiment)
+            simulator._get_cqasm(other_experiment)
+            self.assertEqual('cqasm3', simulator._get_cqasm(experiment))
+
 
 class ApiMock(Mock):
     def __init__(self, spec, *args, **kwargs):
@@ -627,3 +627,10 @@ class TestQiCircuitToString(unittest.TestCase):
         lowest_mask_bit, mask_length = CircuitToString.get_mask_data(mask)
         self.assertEqual(lowest_mask_bit, 6)
         self.assertEqual(mask_length, 2)
+
+    def test_get_gate_function(self):
+        parser = CircuitToString()
+        self.assertEqual(parser._get_gate_function('H'), parser._h)
+        self.assertEqual(parser._get_gate_function('h', binary_controlled=True), parser._c_h)
+        self.assertEqual(parser._get_gate_function('bla'), parser._gate_not_supported)
+        self.assertIs(parser._get_gate_function('H'), parser._get_gate_function('H'))
@@ -86,6 +86,15 @@ class TestQuantumInspireAPI(TestCase):
         actual = api._get(mock_key)
         self.assertEqual(expected, actual)
 
+    def test_coreapi_client_uses_keep_alive_session(self):
+        with patch.object(QuantumInspireAPI, '_load_schema'):
+            api = QuantumInspireAPI('FakeURL', self.token_authentication)
+        session = api._QuantumInspireAPI__client.transports[0]._session
+        self.assertIs(self.token_authentication, session.auth)
+        adapter = session.get_adapter('https://api.quantum-inspire.com/')
+        self.assertEqual(16, adapter._pool_maxsize)
+        self.assertEqual(3, adapter.max_retries.total)
+
     def test_action_has_correct_output(self, mock_key='MockKey', mock_result=1234):
         def mock_result_callable(mock_api, document, keys, params=None, validate=None,
                                  overrides=None, action=None, encoding=None, transform=None):